@@ -3,17 +3,34 @@
 import argparse
 import csv
 import logging
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-from logging_config import setup_logging
-from guest_calculator import calculate_guest
+import ahocorasick
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    import hyperscan
+except ImportError:  # optional, pyahocorasick is used without it
+    hyperscan = None
+
+from logging_config import setup_logging, setup_worker_logging, worker_logging
+from guest_calculator import calculate_guests
+from utils import sanitize_channel_handle
 
 TRANSCRIPTION_DIR = 'transcriptions'
 GENERATED_DIR = 'generated'
 ANALYSIS_CSV = 'generated/analysis_results.csv'
 FILTERED_VIDEOS_CSV = 'generated/filtered_videos.csv'
 MISSING_TRANSCRIPT_CSV = 'generated/missing_transcripts.csv'
+# `published_at` is an alternative name of `publishedAt`
+FILTERED_VIDEOS_COLUMNS = ['videoId', 'channelHandle', 'title', 'description', 'publishedAt', 'published_at']
 
 KEYWORDS = [
     'kredyt', '0%',
@@ -25,6 +42,24 @@ KEYWORD_WEIGHTS = {
 CONTEXT_LINES = 5
 SCORE_DECIMALS = 0
 LINE_JOIN_CHAR = '\n'
+ANALYSIS_SCHEMA = pa.schema([
+    ('videoId', pa.string()),
+    ('guest', pa.string()),
+    ('publishedAt', pa.string()),
+    ('keywords_found', pa.string()),
+    ('timestamp_start', pa.string()),
+    ('timestamp_end', pa.string()),
+    ('length_seconds', pa.int64()),
+    ('transcription_lines', pa.string()),
+    ('score', pa.float64() if SCORE_DECIMALS else pa.int64()),
+    ('youtube_link', pa.string()),
+])
+ANALYSIS_FIELDS = ANALYSIS_SCHEMA.names
+
+# [12:21] Lorem ipsum -> (12:21, Lorem ipsum), a line without timestamp -> ('', line)
+PARSE_RE = re.compile(r'^[^\S\n]*(?:\[([^\]\n]*)\])?[^\S\n]*(.*?)[^\S\n]*$', re.M)
+# the part of a line before its text in PARSE_RE, matched from the line start
+LINE_PREFIX_RE = re.compile(r'[^\S\n]*(?:\[[^\]\n]*\])?[^\S\n]*')
 
 def parse_arguments():
     """
@@ -38,87 +73,132 @@ def parse_arguments():
     parser.add_argument('--analysis_csv', type=str, default=ANALYSIS_CSV, help='Path to output analysis CSV file')
     parser.add_argument('--filtered_videos_csv', type=str, default=FILTERED_VIDEOS_CSV, help='Path to filtered videos CSV file')
     parser.add_argument('--missing_transcript_csv', type=str, default=MISSING_TRANSCRIPT_CSV, help='Path to missing transcripts CSV file')
+    parser.add_argument('--parquet', action='store_true', help='Save analysis results as Parquet (next to --analysis_csv) instead of CSV')
     return parser.parse_args()
 
 
-def sanitize_channel_handle(channel_handle):
-    """
-    Sanitizes the channel handle to create a safe directory name.
-    The same logic as `download_transcriptions.py`
-    """
-    sanitized = channel_handle.replace(' ', '_')
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', sanitized)
-    return sanitized[:50]
-
-
 def load_filtered_videos(csv_file):
     mapping = {}
     if not os.path.exists(csv_file):
         logging.error(f"Filtered videos CSV file does not exist: {csv_file}")
         return mapping
 
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            video_id = row.get('videoId')
-            channel_handle = row.get('channelHandle')
-            title = row.get('title', '')
-            description = row.get('description', '')
-            published_at = row.get('publishedAt', '')
-            if not published_at:
-                published_at = row.get('published_at', '')
-
-            if video_id and channel_handle:
-                guest = calculate_guest(channel_handle, title, description)
-                mapping[video_id] = {
-                    'channelHandle': channel_handle,
-                    'guest': guest,
-                    'publishedAt': published_at
-                }
-                logging.debug(f"Loaded videoId={video_id}, guest={guest}")
-            else:
-                logging.warning(f"Missing videoId or channelHandle in row: {row}")
+    try:
+        df = pd.read_csv(
+            csv_file,
+            usecols=lambda column: column in FILTERED_VIDEOS_COLUMNS,
+            dtype=str,
+            keep_default_na=False
+        )
+    except pd.errors.EmptyDataError:
+        logging.error(f"Filtered videos CSV file is empty: {csv_file}")
+        return mapping
+    df = df.reindex(columns=FILTERED_VIDEOS_COLUMNS, fill_value='')
+    published_at_column = df['publishedAt'].where(df['publishedAt'] != '', df['published_at'])
+    guest_column = calculate_guests(df['channelHandle'], df['title'], df['description'])
+
+    for video_id, channel_handle, guest, published_at in zip(
+            df['videoId'], df['channelHandle'], guest_column, published_at_column):
+        if video_id and channel_handle:
+            mapping[video_id] = {
+                'channelHandle': channel_handle,
+                'guest': guest,
+                'publishedAt': published_at
+            }
+            logging.debug(f"Loaded videoId={video_id}, guest={guest}")
+        else:
+            logging.warning(f"Missing videoId or channelHandle in row: videoId={video_id}, channelHandle={channel_handle}")
     logging.info(f"Loaded {len(mapping)} videos from {csv_file}")
     return mapping
 
 
-def parse_line(line_content):
+def build_keyword_automaton(keywords, weights):
     """
-    [12:21] Lorem ipsum -> (12:21, Lorem ipsum, [12:21] Lorem ipsum)
+    Builds an Aho-Corasick automaton matching all (lowercased) keywords in one pass.
+
+    Args:
+        keywords (list): Keywords to search for.
+        weights (dict): Keyword weights.
+
+    Returns:
+        ahocorasick.Automaton: Automaton with (kw_idx, kw_length, weight) payloads.
     """
-    line_content = line_content.strip()
-    closing_bracket_index = line_content.find(']')
-    if closing_bracket_index != -1 and line_content.startswith('['):
-        timestamp_str = line_content[1:closing_bracket_index]
-        text_str = line_content[closing_bracket_index + 1:].strip()
-    else:
-        timestamp_str = ''
-        text_str = line_content
-    return timestamp_str, text_str, line_content
-
-def count_keyword_occurrences_in_line(text, kw):
-    kw_lower = kw.lower()
-    line_lower = text.lower()
-    # adding space before to avoid match substrings
-    search_line = " " + line_lower
-    return search_line.count(" " + kw_lower)
-
-def count_keywords_in_extended_lines(extended_lines, keywords):
-    counts = {kw: 0 for kw in keywords}
-    for line_text in extended_lines:
-        for kw in keywords:
-            counts[kw] += count_keyword_occurrences_in_line(line_text, kw)
-    return counts
-
-def find_keywords_in_line(text, keywords):
-    found = []
-    line_lower = text.lower()
-    for kw in keywords:
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(keywords):
         kw_lower = kw.lower()
-        if line_lower.startswith(kw_lower) or f" {kw_lower}" in line_lower:
-            found.append(kw)
-    return found
+        automaton.add_word(kw_lower, (idx, len(kw_lower), weights.get(kw, 1.0)))
+    automaton.make_automaton()
+    return automaton
 
+def build_keyword_database(keywords):
+    """
+    Compiles a Hyperscan block-mode database matching all (lowercased) keywords in one pass.
+
+    Args:
+        keywords (list): Keywords to search for.
+
+    Returns:
+        hyperscan.Database: Database with keyword indexes as pattern ids.
+    """
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[re.escape(kw.lower()).encode('utf-8') for kw in keywords],
+        ids=list(range(len(keywords))),
+        elements=len(keywords),
+        flags=hyperscan.HS_FLAG_SOM_LEFTMOST
+    )
+    return database
+
+def build_keyword_matcher(keywords, weights):
+    """
+    Hyperscan database when `hyperscan` is installed, Aho-Corasick automaton otherwise.
+    """
+    if hyperscan is not None:
+        return build_keyword_database(keywords)
+    return build_keyword_automaton(keywords, weights)
+
+def find_keyword_hits(matcher, text_lower):
+    """
+    Scans the whole (lowercased) transcript once.
+    Keyword has to start a word of the line text parsed by PARSE_RE - the same as `" " + kw in " " + text`
+    trick - to avoid matching substrings. Hits inside the `[timestamp]` prefix don't count.
+
+    Returns:
+        list: (line_idx, kw_idx) tuples, one per occurrence.
+    """
+    if isinstance(matcher, ahocorasick.Automaton):
+        starts = sorted(
+            (end - kw_length + 1, kw_idx)
+            for end, (kw_idx, kw_length, _) in matcher.iter(text_lower)
+        )
+    else:
+        # Hyperscan works on bytes, so its offsets are converted to character offsets - word checks below
+        # have to see the same (Unicode) whitespace as PARSE_RE does
+        text_bytes = text_lower.encode('utf-8')
+        byte_starts = []
+        matcher.scan(text_bytes, match_event_handler=lambda kw_idx, start, end, flags, context: byte_starts.append((start, kw_idx)))
+        starts = []
+        char_start, previous_byte_start = 0, 0
+        for byte_start, kw_idx in sorted(byte_starts):
+            # keywords start at a character boundary, so decoding between consecutive hits is safe
+            char_start += len(text_bytes[previous_byte_start:byte_start].decode('utf-8'))
+            previous_byte_start = byte_start
+            starts.append((char_start, kw_idx))
+
+    # line index is counted natively with `count` between consecutive hits, no per-line table
+    hits = []
+    line_idx, previous_start, text_start = 0, 0, None
+    for start, kw_idx in starts:
+        new_lines = text_lower.count('\n', previous_start, start)
+        if new_lines or text_start is None:
+            text_start = LINE_PREFIX_RE.match(text_lower, text_lower.rfind('\n', 0, start) + 1).end()
+        line_idx += new_lines
+        previous_start = start
+        if start == text_start or (start > text_start and text_lower[start - 1] == ' '):
+            hits.append((line_idx, kw_idx))
+    return hits
+
+@lru_cache(maxsize=8192)
 def timestamp_to_seconds(ts_str):
     """
     mm:ss or hh:mm:ss -> seconds
@@ -140,132 +220,226 @@ def timestamp_to_seconds(ts_str):
         return 0
     return 0
 
-def calculate_score(extended_lines, keywords, weights):
+def keyword_prefix_sums(keyword_hits, keywords_count, lines_count):
     """
-    Simple score calculator for keywords.
-    """
-    kw_counts = count_keywords_in_extended_lines(extended_lines, keywords)
-    score = 0.0
-    found_keywords = []
+    Builds per-keyword prefix sums over lines: cum[k, i] = number of keyword-k hits in lines[0..i-1].
 
-    for kw, cnt in kw_counts.items():
-        if cnt > 0:
-            w = weights.get(kw, 1.0)  # DEFAULT VALUE
-            score += cnt * w
-            found_keywords.append(kw)
+    Returns:
+        numpy.ndarray: Array of shape (keywords_count, lines_count + 1).
+    """
+    cum = np.zeros((keywords_count, lines_count + 1), dtype=np.int32)
+    if keyword_hits:
+        line_idx, kw_idx = zip(*keyword_hits)
+        np.add.at(cum, (np.array(kw_idx), np.array(line_idx) + 1), 1)
+    return cum.cumsum(axis=1)
 
+def score_window(cum, s, e, keywords, weight_vec):
+    """
+    Simple score calculator for keywords in lines[s..e], O(1) per keyword thanks to prefix sums.
+    """
+    kw_counts = cum[:, e + 1] - cum[:, s]
+    score = float(kw_counts @ weight_vec)
+    found_keywords = [kw for kw, cnt in zip(keywords, kw_counts) if cnt > 0]
     return score, found_keywords
 
-def analyze_transcriptions(filtered_videos_map, directory, keywords, weights):
-    results = []
-    missing_transcriptions = []
-    transcriptions_with_no_keywords = 0
-    total_videos = len(filtered_videos_map)
-    processed_videos = 0
+def list_existing_transcriptions(directory, sanitized_handles):
+    """
+    Lists transcription files with one `os.scandir` per channel directory.
 
-    for video_id, data in filtered_videos_map.items():
-        channel_handle = data['channelHandle']
-        sanitized_handle = sanitize_channel_handle(channel_handle)
-        transcription_file = os.path.join(directory, sanitized_handle, f"{video_id}.txt")
+    Returns:
+        dict: Mapping of sanitized channel handle to a set of file names.
+    """
+    existing = {}
+    for sanitized_handle in sanitized_handles:
+        try:
+            with os.scandir(os.path.join(directory, sanitized_handle)) as it:
+                existing[sanitized_handle] = {entry.name for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            existing[sanitized_handle] = set()
+    return existing
 
-        if not os.path.exists(transcription_file):
-            logging.warning(f"Transcription file does not exist: {transcription_file}")
-            missing_transcriptions.append({
-                'videoId': video_id,
-                'channelHandle': channel_handle,
-                'publishedAt': data.get('publishedAt', '')
-            })
-            continue
+# Keyword matcher of a worker process, see `_init_worker`
+_matcher = None
+_keywords_lower = ()
 
-        try:
-            with open(transcription_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except Exception as e:
-            logging.error(f"Error reading transcription file {transcription_file}: {e}")
-            missing_transcriptions.append(video_id)
-            continue
+def _init_worker(keywords, weights, log_queue, log_level):
+    """
+    Sets up logging and builds the keyword matcher once per worker process.
+    """
+    global _matcher, _keywords_lower
+    setup_worker_logging(log_queue, log_level)
+    _matcher = build_keyword_matcher(keywords, weights)
+    _keywords_lower = tuple(kw.lower() for kw in keywords)
 
-        parsed_lines = []
-        for line_content in lines:
-            timestamp, text_str, full_line = parse_line(line_content)
-            parsed_lines.append((timestamp, text_str, full_line))
-
-        hits = []
-        for i, (timestamp, text_str, full_line) in enumerate(parsed_lines):
-            found_any = False
-            for kw in keywords:
-                if count_keyword_occurrences_in_line(text_str, kw) > 0:
-                    found_any = True
-                    logging.debug(f"Keyword '{kw}' found in videoId={video_id} at line {i}: {text_str}")
-                    break
-            if found_any:
-                start_idx = max(0, i - CONTEXT_LINES)
-                end_idx = min(len(parsed_lines) - 1, i + CONTEXT_LINES)
-                hits.append((start_idx, end_idx, i))
-
-        if not hits:
-            logging.debug(f"No keywords found in transcription for videoId={video_id}")
-            transcriptions_with_no_keywords += 1
-            continue  # no keywords then skip
-
-        # Merge overlapping hits
-        hits.sort(key=lambda x: x[0])
-        merged = []
-        current_start, current_end = None, None
-        indexes_in_range = []
-
-        for (s, e, main_i) in hits:
-            if current_start is None:
+def process_video(args):
+    """
+    Finds keyword windows in a single transcription.
+
+    Args:
+        args (tuple): (video_id, data, transcription_file, keywords, weights)
+
+    Returns:
+        tuple: (results, missing) - list of result rows (empty when no keywords found)
+            or None with the missing transcription row when the file cannot be read.
+    """
+    video_id, data, transcription_file, keywords, weights = args
+    try:
+        with open(transcription_file, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except Exception as e:
+        logging.error(f"Error reading transcription file {transcription_file}: {e}")
+        return None, {
+            'videoId': video_id,
+            'channelHandle': data['channelHandle'],
+            'publishedAt': data.get('publishedAt', '')
+        }
+
+    # the same lines as `readlines()` would give
+    if text.endswith('\n'):
+        text = text[:-1]
+    text_lower = text.lower()
+
+    # most transcriptions have no keywords at all, skip them before scanning and parsing lines
+    if not any(kw in text_lower for kw in _keywords_lower):
+        logging.debug(f"No keywords found in transcription for videoId={video_id}")
+        return [], None
+
+    keyword_hits = find_keyword_hits(_matcher, text_lower)
+    if not keyword_hits:
+        logging.debug(f"No keywords found in transcription for videoId={video_id}")
+        return [], None  # no keywords then skip
+
+    timestamps, line_texts = zip(*PARSE_RE.findall(text))
+    hits = []
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for i in sorted({line_idx for line_idx, _ in keyword_hits}):
+        if debug:
+            logging.debug(f"Keyword found in videoId={video_id} at line {i}: {line_texts[i]}")
+        start_idx = max(0, i - CONTEXT_LINES)
+        end_idx = min(len(line_texts) - 1, i + CONTEXT_LINES)
+        hits.append((start_idx, end_idx, i))
+
+    # Merge overlapping hits
+    hits.sort(key=lambda x: x[0])
+    merged = []
+    current_start, current_end = None, None
+    indexes_in_range = []
+
+    for (s, e, main_i) in hits:
+        if current_start is None:
+            current_start = s
+            current_end = e
+            indexes_in_range = [main_i]
+        else:
+            if s <= current_end + 1:
+                current_end = max(current_end, e)
+                indexes_in_range.append(main_i)
+            else:
+                merged.append((current_start, current_end, indexes_in_range))
                 current_start = s
                 current_end = e
                 indexes_in_range = [main_i]
-            else:
-                if s <= current_end + 1:
-                    current_end = max(current_end, e)
-                    indexes_in_range.append(main_i)
-                else:
-                    merged.append((current_start, current_end, indexes_in_range))
-                    current_start = s
-                    current_end = e
-                    indexes_in_range = [main_i]
 
-        if current_start is not None:
-            merged.append((current_start, current_end, indexes_in_range))
+    if current_start is not None:
+        merged.append((current_start, current_end, indexes_in_range))
+
+    cum = keyword_prefix_sums(keyword_hits, len(keywords), len(line_texts))
+    weight_vec = np.array([weights.get(kw, 1.0) for kw in keywords])  # DEFAULT VALUE
 
-        for (s, e, idx_list) in merged:
-            extended_texts = [pl[1] for pl in parsed_lines[s:e + 1]]
-            transcription_lines = LINE_JOIN_CHAR.join(extended_texts)
-            timestamp_start = parsed_lines[s][0] if parsed_lines[s][0] else '0:00'
-            timestamp_end = parsed_lines[e][0] if parsed_lines[e][0] else '0:00'
+    results = []
+    for (s, e, idx_list) in merged:
+        transcription_lines = LINE_JOIN_CHAR.join(line_texts[s:e + 1])
+        timestamp_start = timestamps[s] or '0:00'
+        timestamp_end = timestamps[e] or '0:00'
 
-            score, found_keywords = calculate_score(extended_texts, keywords, weights)
+        score, found_keywords = score_window(cum, s, e, keywords, weight_vec)
 
-            start_seconds = timestamp_to_seconds(timestamp_start)
-            end_seconds = timestamp_to_seconds(timestamp_end)
-            length_seconds = max(0, end_seconds - start_seconds)
+        start_seconds = timestamp_to_seconds(timestamp_start)
+        end_seconds = timestamp_to_seconds(timestamp_end)
+        length_seconds = max(0, end_seconds - start_seconds)
 
-            youtube_link = f"https://www.youtube.com/watch?v={video_id}&t={start_seconds}s"
+        youtube_link = f"https://www.youtube.com/watch?v={video_id}&t={start_seconds}s"
+
+        score_rounded = round(score, SCORE_DECIMALS)
+        if SCORE_DECIMALS == 0:
+            score_rounded = int(score_rounded)
+
+        results.append({
+            'videoId': video_id,
+            'guest': data['guest'],
+            'publishedAt': data['publishedAt'],
+            'keywords_found': ', '.join(sorted(found_keywords)),
+            'timestamp_start': timestamp_start,
+            'timestamp_end': timestamp_end,
+            'length_seconds': length_seconds,
+            'transcription_lines': transcription_lines,
+            'score': score_rounded,
+            'youtube_link': youtube_link
+        })
+
+
+    return results, None
+
+def analyze_transcriptions(filtered_videos_map, directory, keywords, weights, write_rows):
+    """
+    Analyzes transcriptions and passes result rows to `write_rows` as they are produced.
+
+    Returns:
+        int: Number of written result rows.
+    """
+    results_count = 0
+    missing_transcriptions = []
+    transcriptions_with_no_keywords = 0
+    total_videos = len(filtered_videos_map)
+    processed_videos = 0
 
-            score_rounded = round(score, SCORE_DECIMALS)
-            if SCORE_DECIMALS == 0:
-                score_rounded = int(score_rounded)
+    # sanitize each distinct handle once
+    sanitized = {
+        channel_handle: sanitize_channel_handle(channel_handle)
+        for channel_handle in {data['channelHandle'] for data in filtered_videos_map.values()}
+    }
+    sanitized_handles = set(sanitized.values())
+    existing = list_existing_transcriptions(directory, sanitized_handles)
+    # joined once per channel, the loop below only concatenates file names
+    channel_dirs = {sanitized_handle: os.path.join(directory, sanitized_handle, '') for sanitized_handle in sanitized_handles}
+
+    tasks = []
+    for video_id, data in filtered_videos_map.items():
+        channel_handle = data['channelHandle']
+        sanitized_handle = sanitized[channel_handle]
+        file_name = f"{video_id}.txt"
+        transcription_file = channel_dirs[sanitized_handle] + file_name
 
-            results.append({
+        if file_name not in existing[sanitized_handle]:
+            logging.warning(f"Transcription file does not exist: {transcription_file}")
+            missing_transcriptions.append({
                 'videoId': video_id,
-                'guest': data['guest'],
-                'publishedAt': data['publishedAt'],
-                'keywords_found': ', '.join(sorted(found_keywords)),
-                'timestamp_start': timestamp_start,
-                'timestamp_end': timestamp_end,
-                'length_seconds': length_seconds,
-                'transcription_lines': transcription_lines,
-                'score': score_rounded,
-                'youtube_link': youtube_link
+                'channelHandle': channel_handle,
+                'publishedAt': data.get('publishedAt', '')
             })
+            continue
 
-        processed_videos += 1
-        if processed_videos % 10 == 0 or processed_videos == total_videos:
-            logging.info(f"Processed {processed_videos}/{total_videos} videos")
+        tasks.append((video_id, data, transcription_file, keywords, weights))
+
+    # 'spawn' doesn't fork the running logging thread and behaves the same on every platform
+    mp_context = multiprocessing.get_context('spawn')
+    log_level = logging.getLogger().getEffectiveLevel()
+    with worker_logging(mp_context) as log_queue, ProcessPoolExecutor(
+        mp_context=mp_context, initializer=_init_worker, initargs=(keywords, weights, log_queue, log_level)
+    ) as executor:
+        for video_results, missing in executor.map(process_video, tasks, chunksize=32):
+            if missing is not None:
+                missing_transcriptions.append(missing)
+                continue
+            if not video_results:
+                transcriptions_with_no_keywords += 1
+                continue
+
+            write_rows(video_results)
+            results_count += len(video_results)
+            processed_videos += 1
+            if processed_videos % 10 == 0 or processed_videos == total_videos:
+                logging.info(f"Processed {processed_videos}/{total_videos} videos")
 
     logging.info(f"Total analyzed videos: {processed_videos}")
     logging.info(f"Total transcriptions with no keywords: {transcriptions_with_no_keywords}")
@@ -283,22 +457,48 @@ def analyze_transcriptions(filtered_videos_map, directory, keywords, weights):
         except Exception as e:
             logging.error(f"Error writing missing transcriptions to CSV: {e}")
 
-    return results
+    return results_count
 
-def save_analysis(results, output_csv):
-    if not results:
-        logging.info("No results to save.")
-        return
-
-    keys = results[0].keys()
+def save_analysis_csv(filtered_videos_map, directory, output_csv):
+    """
+    Analyzes transcriptions, results are written to CSV as they come.
+    """
     try:
         with open(output_csv, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
+            writer = csv.DictWriter(f, fieldnames=ANALYSIS_FIELDS)
             writer.writeheader()
-            writer.writerows(results)
-        logging.info(f"Analysis completed. Results saved to {output_csv}.")
-    except Exception as e:
+            results_count = analyze_transcriptions(
+                filtered_videos_map,
+                directory,
+                KEYWORDS,
+                KEYWORD_WEIGHTS,
+                writer.writerows
+            )
+    except OSError as e:
         logging.error(f"Error writing to CSV {output_csv}: {e}")
+        return
+    logging.info(f"Analysis completed. {results_count} results saved to {output_csv}.")
+
+def save_analysis_parquet(filtered_videos_map, directory, output_csv):
+    """
+    Analyzes transcriptions and saves all results as a single zstd-compressed Parquet file.
+    """
+    output_parquet = os.path.splitext(output_csv)[0] + '.parquet'
+    results = []
+    analyze_transcriptions(
+        filtered_videos_map,
+        directory,
+        KEYWORDS,
+        KEYWORD_WEIGHTS,
+        results.extend
+    )
+    try:
+        table = pa.Table.from_pylist(results, schema=ANALYSIS_SCHEMA)
+        pq.write_table(table, output_parquet, compression='zstd')
+    except (OSError, pa.ArrowException) as e:
+        logging.error(f"Error writing to Parquet {output_parquet}: {e}")
+        return
+    logging.info(f"Analysis completed. {len(results)} results saved to {output_parquet}.")
 
 def main():
     """
@@ -327,15 +527,10 @@ def main():
         return
 
     # Analyze transcriptions
-    analysis_results = analyze_transcriptions(
-        filtered_videos_map,
-        args.transcription_dir,
-        KEYWORDS,
-        KEYWORD_WEIGHTS
-    )
-
-    # Save analysis results
-    save_analysis(analysis_results, args.analysis_csv)
+    if args.parquet:
+        save_analysis_parquet(filtered_videos_map, args.transcription_dir, args.analysis_csv)
+    else:
+        save_analysis_csv(filtered_videos_map, args.transcription_dir, args.analysis_csv)
     logging.info("Transcription analysis finished")
 
 if __name__ == '__main__':
@@ -4,7 +4,7 @@ import logging
 import os
 import re
 import sys
-from collections import defaultdict
+from functools import lru_cache
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -14,11 +14,16 @@ DEFAULT_INPUT_CSV = '../generated/filtered_videos.csv'
 DEFAULT_TRANSCRIPTS_DIR = '../transcriptions'
 DEFAULT_CHART_DIR = '../charts'
 DEFAULT_WINDOW_DAYS = 14
+CHART_DPI = 100
 
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+_WORD_RE = re.compile(r'\b\w+\b')
 
+
+@lru_cache(maxsize=None)
 def sanitize_channel_handle(channel_handle):
     sanitized = channel_handle.replace(' ', '_').replace('.', '_')
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', sanitized)
+    sanitized = _SANITIZE_RE.sub('', sanitized)
     return sanitized[:50]
 
 
@@ -28,8 +33,8 @@ def count_keywords_and_words(transcript_text, keywords):
     for kw in keywords:
         counts[kw] = text_lower.count(kw.lower())
 
-    # count numer of all words
-    total_words = len(re.findall(r'\b\w+\b', transcript_text))
+    # count numer of all words, without materializing the list of them
+    total_words = sum(1 for _ in _WORD_RE.finditer(transcript_text))
 
     return counts, total_words
 
@@ -87,26 +92,22 @@ def main():
         logging.error(f"File should contain columns: {required_columns}")
         sys.exit(1)
 
-    # for collecting data
-    keyword_counts_per_date = defaultdict(lambda: {kw: 0 for kw in KEYWORDS})
-    total_words_per_date = defaultdict(int)
-    videos_with_keywords_per_date = defaultdict(int)
-
-    for index, row in df.iterrows():
-        video_id = row['videoId']
-        channel_handle = row['channelHandle']
-        published_at = row['publishedAt']
+    # for collecting data, one entry per transcript
+    dates = []
+    normalized_counts = []
+    has_keywords = []
 
+    for video_id, channel_handle, published_at in zip(df['videoId'], df['channelHandle'], df['publishedAt']):
         sanitized_handle = sanitize_channel_handle(channel_handle)
         transcript_file = os.path.join(transcriptions_dir, sanitized_handle, f"{video_id}.txt")
 
-        if not os.path.exists(transcript_file):
-            logging.warning(f"Missing transcript: {transcript_file}")
-            continue
-
+        # open directly instead of checking existence first, a missing file costs one failed syscall
         try:
-            with open(transcript_file, 'r', encoding='utf-8') as f:
+            with open(transcript_file, 'r', encoding='utf-8', errors='replace') as f:
                 transcript_text = f.read()
+        except FileNotFoundError:
+            logging.warning(f"Missing transcript: {transcript_file}")
+            continue
         except Exception as e:
             logging.error(f"Error while reading {transcript_file}: {e}")
             continue
@@ -117,45 +118,28 @@ def main():
             logging.warning(f"Transcript {transcript_file} is empty")
             continue
 
-        # normalize per 1000 chars
-        normalized_counts = {kw: (counts[kw] / total_words) * 1000 for kw in KEYWORDS}
-
-        # collecting data update
-        for kw in KEYWORDS:
-            keyword_counts_per_date[published_at][kw] += normalized_counts[kw]
-        total_words_per_date[published_at] += total_words
-
-        # find if keywords appeared
-        if any(counts[kw] > 0 for kw in KEYWORDS):
-            videos_with_keywords_per_date[published_at] += 1
-
-    # Convert to DataFrame
-    dates = sorted(set(list(keyword_counts_per_date.keys()) + list(videos_with_keywords_per_date.keys())))
-
-    keyword_data = {kw: [] for kw in KEYWORDS}
-    video_keyword_data = []
-    total_normalized_counts = []
-
-    for date in dates:
-        for kw in KEYWORDS:
-            keyword_data[kw].append(keyword_counts_per_date[date][kw])
-        video_keyword_data.append(videos_with_keywords_per_date[date])
-        total_normalized_counts.append(sum(keyword_counts_per_date[date][kw] for kw in KEYWORDS))
+        # normalize per 1000 words
+        total_count = sum(counts.values())
+        dates.append(published_at)
+        normalized_counts.append(total_count / total_words * 1000)
+        has_keywords.append(total_count > 0)
 
-    df_keywords = pd.DataFrame(keyword_data, index=dates)
-    df_video_keywords = pd.Series(video_keyword_data, index=dates)
-    df_total_normalized = pd.Series(total_normalized_counts, index=dates)
+    # aggregate per date
+    agg = pd.DataFrame({'date': dates, 'norm': normalized_counts, 'videos_with_keywords': has_keywords})
+    per_day = agg.groupby('date').agg(
+        norm=('norm', 'sum'),
+        videos_with_keywords=('videos_with_keywords', 'sum'),
+    )
 
     # Convert index to datetime (for better preset)
-    df_keywords.index = pd.to_datetime(df_keywords.index)
-    df_video_keywords.index = pd.to_datetime(df_video_keywords.index)
-    df_total_normalized.index = pd.to_datetime(df_total_normalized.index)
+    per_day.index = pd.to_datetime(per_day.index)
+    df_total_normalized = per_day['norm']
 
     # calculate moving sum
     df_total_normalized_rolling = df_total_normalized.rolling(window=window_days, min_periods=1).sum()
 
     # Create chart
-    plt.figure(figsize=(20, 10), dpi=300)
+    plt.figure(figsize=(16, 8), dpi=CHART_DPI)
     plt.plot(df_total_normalized_rolling.index, df_total_normalized_rolling.values, color='purple',
              label=f'{window_days}-d sum', linewidth=2)
     plt.xlabel('date', fontsize=14)
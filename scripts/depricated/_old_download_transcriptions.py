@@ -2,7 +2,9 @@ import csv
 import os
 import logging
 import re
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound, VideoUnavailable, TooManyRequests
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,6 +18,9 @@ logging.basicConfig(
 
 INPUT_CSV = 'filtered_videos.csv'
 OUTPUT_DIR = '../../transcriptions'
+MAX_WORKERS = 16
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 5
 
 
 def sanitize_channel_handle(channel_handle):
@@ -25,18 +30,28 @@ def sanitize_channel_handle(channel_handle):
 
 
 def download_transcript(video_id):
-    try:
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, 'pl')
-        return transcript
-    except TranscriptsDisabled:
-        logging.warning(f"Transcripts disabled for videoId={video_id}")
-    except NoTranscriptFound:
-        logging.warning(f"No transcript found for videoId={video_id}")
-    except VideoUnavailable:
-        logging.error(f"Video unavailable: videoId={video_id}")
-        return None
-    except Exception as e:
-        logging.error(f"Unexpected error for videoId={video_id}: {e}")
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            transcript = YouTubeTranscriptApi.get_transcript(video_id, 'pl')
+            return transcript
+        except TooManyRequests:
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            logging.warning(f"Too many requests for videoId={video_id}, retry in {delay}s")
+            time.sleep(delay)
+        except TranscriptsDisabled:
+            logging.warning(f"Transcripts disabled for videoId={video_id}")
+            return None
+        except NoTranscriptFound:
+            logging.warning(f"No transcript found for videoId={video_id}")
+            return None
+        except VideoUnavailable:
+            logging.error(f"Video unavailable: videoId={video_id}")
+            return None
+        except Exception as e:
+            logging.error(f"Unexpected error for videoId={video_id}: {e}")
+            return None
+    logging.error(f"Too many requests for videoId={video_id}, giving up after {MAX_RETRIES} retries")
+    return None
 
 def save_transcript(video_id, channel_handle, transcript):
     sanitized_handle = sanitize_channel_handle(channel_handle)
@@ -46,15 +61,15 @@ def save_transcript(video_id, channel_handle, transcript):
 
     transcription_file = os.path.join(channel_dir, f"{video_id}.txt")
 
-    lines = []
+    # one growing buffer and a single write instead of a list of lines joined at the end
+    buf = bytearray()
     for entry in transcript:
         start_time = entry['start']
         minutes, seconds = divmod(int(start_time), 60)
-        formatted_time = f"{minutes}:{seconds:02d}"
-        lines.append(f"[{formatted_time}] {entry['text']}")
+        buf += f"[{minutes}:{seconds:02d}] {entry['text']}\n".encode('utf-8')
 
-    with open(transcription_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines))
+    with open(transcription_file, 'wb') as f:
+        f.write(buf)
     logging.info(f"Transcription saved: {transcription_file}")
 
 
@@ -77,26 +92,29 @@ def load_video_data(filename):
 
 
 def fetch_and_save_transcriptions(video_data):
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        logging.info(f"Created directory: {OUTPUT_DIR}")
-
-    total_videos = len(video_data)
-    for idx, video in enumerate(video_data, 1):
-        video_id = video['videoId']
-        channel_handle = video['channelHandle']
-        transcription_file = os.path.join(OUTPUT_DIR, sanitize_channel_handle(channel_handle), f"{video_id}.txt")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+    to_download = []
+    for video in video_data:
+        transcription_file = os.path.join(OUTPUT_DIR, sanitize_channel_handle(video['channelHandle']), f"{video['videoId']}.txt")
         if os.path.exists(transcription_file):
-            logging.info(f"[{idx}/{total_videos}] Transcription already exists: {transcription_file}")
+            logging.info(f"Transcription already exists: {transcription_file}")
             continue
-
-        transcript = download_transcript(video_id)
-        if transcript:
-            save_transcript(video_id, channel_handle, transcript)
-            logging.info(f"[{idx}/{total_videos}] Downloaded and saved transcription for videoId={video_id}")
-        else:
-            logging.info(f"[{idx}/{total_videos}] No transcription available for videoId={video_id}")
+        to_download.append(video)
+
+    # downloads are I/O bound, so run them in threads
+    total_videos = len(to_download)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(download_transcript, video['videoId']): video for video in to_download}
+        for idx, future in enumerate(as_completed(futures), 1):
+            video = futures[future]
+            video_id = video['videoId']
+            transcript = future.result()
+            if transcript:
+                save_transcript(video_id, video['channelHandle'], transcript)
+                logging.info(f"[{idx}/{total_videos}] Downloaded and saved transcription for videoId={video_id}")
+            else:
+                logging.info(f"[{idx}/{total_videos}] No transcription available for videoId={video_id}")
 
 
 def main():
@@ -3,13 +3,18 @@
 import csv
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import YouTubeTranscriptApi, TooManyRequests
 
 from ..logging_config import setup_logging
 
 # Constants
 INPUT_CSV = 'filtered_videos.csv'
+MAX_WORKERS = 16
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 5
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '../..'))
@@ -19,12 +24,20 @@ GENERATED_DIR = os.path.join(project_root, 'generated')
 os.makedirs(GENERATED_DIR, exist_ok=True)
 
 def download_transcript(video_id):
-    try:
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, 'pl')
-        logging.debug(f"Transcript found for video ID {video_id}")
-        return transcript
-    except Exception as e:
-        logging.debug(f"No transcript for video ID {video_id}: {e}")
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            transcript = YouTubeTranscriptApi.get_transcript(video_id, 'pl')
+            logging.debug(f"Transcript found for video ID {video_id}")
+            return transcript
+        except TooManyRequests:
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            logging.warning(f"Too many requests for video ID {video_id}, retry in {delay}s")
+            time.sleep(delay)
+        except Exception as e:
+            logging.debug(f"No transcript for video ID {video_id}: {e}")
+            return None
+    logging.error(f"Too many requests for video ID {video_id}, giving up after {MAX_RETRIES} retries")
+    return None
 
 
 def save_transcript(video_id, transcript):
@@ -34,16 +47,16 @@ def save_transcript(video_id, transcript):
     filename = f"{video_id}.txt"
     file_path = os.path.join(OUTPUT_DIR, filename)
 
-    lines = []
+    # one growing buffer and a single write instead of a list of lines joined at the end
+    buf = bytearray()
     for entry in transcript:
         start_time = entry['start']
         minutes, seconds = divmod(int(start_time), 60)
-        formatted_time = f"{minutes}:{seconds:02d}"
-        lines.append(f"[{formatted_time}] {entry['text']}")
+        buf += f"[{minutes}:{seconds:02d}] {entry['text']}\n".encode('utf-8')
 
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(lines))
+        with open(file_path, 'wb') as f:
+            f.write(buf)
         logging.info(f"Saved transcript for video ID {video_id} to {file_path}")
         return True
     except Exception as e:
@@ -56,13 +69,11 @@ def main():
     script_name = os.path.splitext(os.path.basename(__file__))[0]
     setup_logging(script_name)
 
-    if not os.path.exists(OUTPUT_DIR):
-        try:
-            os.makedirs(OUTPUT_DIR)
-            logging.info(f"Created output directory at {OUTPUT_DIR}")
-        except Exception as e:
-            logging.error(f"Failed to create output directory {OUTPUT_DIR}: {e}")
-            return
+    try:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+    except Exception as e:
+        logging.error(f"Failed to create output directory {OUTPUT_DIR}: {e}")
+        return
 
     input_csv_path = os.path.join(project_root, INPUT_CSV)
 
@@ -70,6 +81,7 @@ def main():
         logging.error(f"Input CSV file does not exist: {input_csv_path}")
         return
 
+    video_ids = []
     with open(input_csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -85,7 +97,14 @@ def main():
                 logging.info(f"Transcript for video ID {video_id} already exists. Skipping download.")
                 continue
 
-            transcript = download_transcript(video_id)
+            video_ids.append(video_id)
+
+    # downloads are I/O bound, so run them in threads
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(download_transcript, video_id): video_id for video_id in video_ids}
+        for future in as_completed(futures):
+            video_id = futures[future]
+            transcript = future.result()
             if transcript:
                 success = save_transcript(video_id, transcript)
                 if success:
@@ -1,42 +1,131 @@
 #!/usr/bin/env python3
 
+import asyncio
+import atexit
 import csv
+import json
 import logging
 import os
-import re
+import time
 
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled, YouTubeTranscriptApi
 
 from logging_config import setup_logging
+from utils import sanitize_channel_handle
 
 # Constants
 INPUT_CSV = 'generated/filtered_videos.csv'
 LANGUAGE_CODES = ['pl']
+MAX_CONCURRENT_DOWNLOADS = 10
 
 # Determine the script's directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '..'))
 OUTPUT_DIR = os.path.join(project_root, 'transcriptions')
 GENERATED_DIR = os.path.join(project_root, 'generated')
+NO_TRANSCRIPT_CACHE_FILE = os.path.join(GENERATED_DIR, f"no_transcript_{'_'.join(LANGUAGE_CODES)}.json")
+# Videos are checked again once their no-transcript entry is older than this
+NO_TRANSCRIPT_CACHE_TTL_DAYS = 7
 
 # Ensure the 'generated' directory exists
 os.makedirs(GENERATED_DIR, exist_ok=True)
 
+# Video IDs known to have no transcript in LANGUAGE_CODES, mapped to the time they were checked,
+# persisted across runs by `main`
+no_transcript_cache = {}
 
+# Directories already created by `ensure_dir` in this process
+_dirs_created = set()
 
-def sanitize_channel_handle(channel_handle):
+
+def ensure_dir(path):
     """
-    Sanitizes the channel handle to create a safe directory name.
+    Creates a directory if needed, at most once per path in this process.
 
     Args:
-        channel_handle (str): The handle of the YouTube channel.
+        path (str): Directory to create.
+    """
+    if path not in _dirs_created:
+        os.makedirs(path, exist_ok=True)
+        _dirs_created.add(path)
+
+
+def list_existing_transcripts(directory):
+    """
+    Lists already downloaded transcripts with a single `os.scandir` walk.
+
+    Args:
+        directory (str): Directory where transcriptions are stored.
 
     Returns:
-        str: Sanitized channel handle.
+        set: Set of (sanitized_channel_handle, video_id) tuples.
+    """
+    existing = set()
+    try:
+        with os.scandir(directory) as channels:
+            for channel in channels:
+                if not channel.is_dir():
+                    continue
+                with os.scandir(channel.path) as files:
+                    existing.update(
+                        (channel.name, entry.name[:-4]) for entry in files if entry.name.endswith('.txt')
+                    )
+    except FileNotFoundError:
+        pass
+    return existing
+
+
+def load_no_transcript_cache(filename, language_codes=LANGUAGE_CODES):
     """
-    sanitized = channel_handle.replace(' ', '_')
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', sanitized)
-    return sanitized[:50]
+    Loads video IDs found to have no transcript in previous runs.
+    The cache is ignored if it was saved for other languages, and entries older than
+    NO_TRANSCRIPT_CACHE_TTL_DAYS are dropped so those videos are checked again.
+
+    Args:
+        filename (str): Path to the JSON cache file.
+        language_codes (list): Language codes the cache must be saved for.
+
+    Returns:
+        dict: Video IDs without a transcript mapped to the time they were checked.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable no-transcript cache {filename}: {e}")
+        return {}
+
+    if data.get('languages') != list(language_codes):
+        logging.info(f"Ignoring no-transcript cache {filename} saved for languages {data.get('languages')}")
+        return {}
+    checked_at = data.get('checked_at', {})
+    if not isinstance(checked_at, dict):
+        logging.warning(f"Ignoring malformed no-transcript cache {filename}")
+        return {}
+    min_checked_at = time.time() - NO_TRANSCRIPT_CACHE_TTL_DAYS * 24 * 60 * 60
+    return {
+        video_id: timestamp
+        for video_id, timestamp in checked_at.items()
+        if isinstance(timestamp, (int, float)) and timestamp >= min_checked_at
+    }
+
+
+def save_no_transcript_cache(filename, language_codes=LANGUAGE_CODES):
+    """
+    Saves video IDs without a transcript for next runs.
+
+    Args:
+        filename (str): Path to the JSON cache file.
+        language_codes (list): Language codes the cache is saved for.
+    """
+    data = {'languages': list(language_codes), 'checked_at': dict(sorted(no_transcript_cache.items()))}
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    except OSError as e:
+        logging.error(f"Error while saving no-transcript cache {filename}: {e}")
 
 
 def download_transcript(video_id, language_codes=LANGUAGE_CODES):
@@ -49,15 +138,27 @@ def download_transcript(video_id, language_codes=LANGUAGE_CODES):
 
     Returns:
         list or None: The transcript if found, else None.
+        Videos without a transcript in any of the languages are added to `no_transcript_cache`.
     """
+    known_missing = True
     for lang in language_codes:
         try:
             transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
             logging.debug(f"Transcript found for video ID {video_id} in language '{lang}'")
             return transcript
-        except Exception as e:
+        except TranscriptsDisabled as e:
+            logging.debug(f"Transcripts disabled for video ID {video_id}: {e}")
+            break
+        except NoTranscriptFound as e:
             logging.debug(f"No transcript in language '{lang}' for video ID {video_id}: {e}")
             continue
+        except Exception as e:
+            # e.g. network errors, worth retrying on the next run
+            logging.debug(f"Failed to get transcript in language '{lang}' for video ID {video_id}: {e}")
+            known_missing = False
+            continue
+    if known_missing:
+        no_transcript_cache[video_id] = time.time()
     logging.debug(f"No transcripts available for video ID {video_id} in languages {language_codes}")
     return None
 
@@ -79,23 +180,19 @@ def save_transcript(channel_handle, video_id, transcript):
 
     sanitized_handle = sanitize_channel_handle(channel_handle)
     channel_dir = os.path.join(OUTPUT_DIR, sanitized_handle)
-    os.makedirs(channel_dir, exist_ok=True)
+    ensure_dir(channel_dir)
 
     filename = f"{video_id}.txt"
     file_path = os.path.join(channel_dir, filename)
     logging.debug(f"File path for transcript: {file_path}")
 
-    # Convert the transcript to a simple format: [min:sec] text
-    lines = []
-    for entry in transcript:
-        start_time = entry['start']
-        minutes, seconds = divmod(int(start_time), 60)
-        formatted_time = f"{minutes}:{seconds:02d}"
-        lines.append(f"[{formatted_time}] {entry['text']}")
-
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(lines))
+        # Write the transcript in a simple format, one line per entry: [min:sec] text
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            f.writelines(
+                f"[{int(entry['start']) // 60}:{int(entry['start']) % 60:02d}] {entry['text']}\n".encode('utf-8')
+                for entry in transcript
+            )
         logging.debug(f"Saved transcript for video ID {video_id} to {file_path}")
         return True
     except Exception as e:
@@ -103,6 +200,45 @@ def save_transcript(channel_handle, video_id, transcript):
         return False
 
 
+async def download_and_save_transcript(semaphore, channel_handle, video_id):
+    """
+    Downloads and saves a single transcript, at most MAX_CONCURRENT_DOWNLOADS at the same time.
+    Blocking calls run in threads, so they don't block the event loop.
+
+    Args:
+        semaphore (asyncio.Semaphore): Limits concurrent downloads.
+        channel_handle (str): The handle of the YouTube channel.
+        video_id (str): The YouTube video ID.
+    """
+    async with semaphore:
+        transcript = await asyncio.to_thread(download_transcript, video_id, LANGUAGE_CODES)
+    if transcript:
+        success = await asyncio.to_thread(save_transcript, channel_handle, video_id, transcript)
+        if success:
+            logging.info(f"Downloaded and saved transcript for video ID {video_id}")
+        else:
+            logging.error(f"Failed to save transcript for video ID {video_id}")
+    else:
+        logging.warning(f"No transcripts available for video ID {video_id}")
+
+
+async def download_transcripts(videos):
+    """
+    Downloads transcripts concurrently.
+
+    Args:
+        videos (list): List of (channel_handle, video_id) tuples.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    results = await asyncio.gather(
+        *[download_and_save_transcript(semaphore, channel_handle, video_id) for channel_handle, video_id in videos],
+        return_exceptions=True
+    )
+    for (channel_handle, video_id), result in zip(videos, results):
+        if isinstance(result, Exception):
+            logging.error(f"Unexpected error for video ID {video_id}: {result}")
+
+
 def main():
     """
     Handle the transcript download process.
@@ -111,13 +247,11 @@ def main():
     script_name = os.path.splitext(os.path.basename(__file__))[0]
     setup_logging(script_name)
 
-    if not os.path.exists(OUTPUT_DIR):
-        try:
-            os.makedirs(OUTPUT_DIR)
-            logging.info(f"Created output directory at {OUTPUT_DIR}")
-        except Exception as e:
-            logging.error(f"Failed to create output directory {OUTPUT_DIR}: {e}")
-            return
+    try:
+        ensure_dir(OUTPUT_DIR)
+    except Exception as e:
+        logging.error(f"Failed to create output directory {OUTPUT_DIR}: {e}")
+        return
 
     # Full path to the input CSV
     input_csv_path = os.path.join(project_root, INPUT_CSV)
@@ -127,13 +261,35 @@ def main():
         logging.error(f"Input CSV file does not exist: {input_csv_path}")
         return
 
-    # Read the CSV and process each video ID
-    with open(input_csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        counter = 1;
+    no_transcript_cache.update(load_no_transcript_cache(NO_TRANSCRIPT_CACHE_FILE))
+    logging.info(f"Loaded {len(no_transcript_cache)} videos known to have no transcript")
+    atexit.register(save_no_transcript_cache, NO_TRANSCRIPT_CACHE_FILE)
+
+    # Collect already downloaded transcripts once instead of checking each file
+    existing = list_existing_transcripts(OUTPUT_DIR)
+    logging.info(f"Found {len(existing)} existing transcripts in {OUTPUT_DIR}")
+
+    # Read the CSV and collect videos without transcripts
+    videos = []
+    with open(input_csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        try:
+            header = next(reader)
+            video_id_index = header.index('videoId')
+            channel_handle_index = header.index('channelHandle')
+        except (StopIteration, ValueError):
+            logging.error(f"Input CSV file has no videoId/channelHandle header: {input_csv_path}")
+            return
+        row_length = max(video_id_index, channel_handle_index) + 1
+
         for row in reader:
-            video_id = row.get('videoId')
-            channel_handle = row.get('channelHandle')
+            if not row:
+                continue  # blank line
+            if len(row) < row_length:
+                logging.warning(f"Malformed row: {row}")
+                continue
+            video_id = row[video_id_index]
+            channel_handle = row[channel_handle_index]
 
             if not video_id:
                 logging.warning(f"Missing videoId in row: {row}")
@@ -145,23 +301,18 @@ def main():
 
             # Check if the transcript already exists
             sanitized_handle = sanitize_channel_handle(channel_handle)
-            transcript_dir = os.path.join(OUTPUT_DIR, sanitized_handle)
-            transcript_path = os.path.join(transcript_dir, f"{video_id}.txt")
-
-            if os.path.exists(transcript_path):
+            if (sanitized_handle, video_id) in existing:
                 logging.info(f"Transcript for video ID {video_id} already exists. Skipping download.")
                 continue
 
-            # Download the transcript
-            transcript = download_transcript(video_id, LANGUAGE_CODES)
-            if transcript:
-                success = save_transcript(channel_handle, video_id, transcript)
-                if success:
-                    logging.info(f"Downloaded and saved transcript for video ID {video_id}")
-                else:
-                    logging.error(f"Failed to save transcript for video ID {video_id}")
-            else:
-                logging.warning(f"No transcripts available for video ID {video_id}")
+            if video_id in no_transcript_cache:
+                logging.info(f"Video ID {video_id} is known to have no transcript. Skipping download.")
+                continue
+
+            videos.append((channel_handle, video_id))
+
+    # Download the transcripts
+    asyncio.run(download_transcripts(videos))
 
     logging.info("Transcript download process finished")
 
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
-import csv
 import logging
 import os
 from datetime import datetime
 
+import pandas as pd
+
 from logging_config import setup_logging
 
 
@@ -44,30 +45,27 @@ def parse_date(date_str):
 def filter_videos(videos, start_date, end_date):
     """
     Filters videos based on publication date.
+    Dates are parsed in one vectorized pass instead of `strptime` per row.
 
     Args:
-        videos (list): List of video dictionaries.
+        videos (pd.DataFrame): Videos loaded by `load_videos`.
         start_date (datetime): Start date.
         end_date (datetime): End date.
 
     Returns:
-        list: Filtered list of videos.
+        pd.DataFrame: Filtered videos.
     """
-    filtered = []
-    for video in videos:
-        published_at = video.get('publishedAt', '')
-        if not published_at:
-            logging.warning(f"Missing 'publishedAt' for video ID {video.get('videoId')}. Skipping.")
-            continue
-        try:
-            published_date = datetime.strptime(published_at[:10], "%Y-%m-%d")
-        except ValueError:
-            logging.warning(
-                f"Invalid 'publishedAt' format for video ID {video.get('videoId')}: {published_at}. Skipping.")
-            continue
-        if start_date <= published_date <= end_date:
-            filtered.append(video)
-    return filtered
+    published_at = videos['publishedAt']
+    published_date = pd.to_datetime(published_at.str.slice(0, 10), format="%Y-%m-%d", errors='coerce', cache=True)
+
+    missing = published_at == ''
+    for video_id in videos.loc[missing, 'videoId']:
+        logging.warning(f"Missing 'publishedAt' for video ID {video_id}. Skipping.")
+    invalid = published_date.isna() & ~missing
+    for video_id, value in zip(videos.loc[invalid, 'videoId'], published_at[invalid]):
+        logging.warning(f"Invalid 'publishedAt' format for video ID {video_id}: {value}. Skipping.")
+
+    return videos[published_date.between(start_date, end_date)]
 
 
 def load_videos(input_file):
@@ -78,14 +76,10 @@ def load_videos(input_file):
         input_file (str): Path to the input CSV file.
 
     Returns:
-        list: List of video dictionaries.
+        pd.DataFrame: Videos, all columns as strings.
     """
-    videos = []
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                videos.append(row)
+        videos = pd.read_csv(input_file, dtype=str, keep_default_na=False)
         logging.info(f"Loaded {len(videos)} videos from {input_file}")
     except FileNotFoundError:
         logging.error(f"Input file {input_file} not found.")
@@ -101,21 +95,17 @@ def save_videos(videos, output_file):
     Saves filtered videos to a CSV file.
 
     Args:
-        videos (list): List of filtered video dictionaries.
+        videos (pd.DataFrame): Filtered videos.
         output_file (str): Path to the output CSV file.
 
     Returns:
         None
     """
-    if not videos:
+    if videos.empty:
         logging.info("No videos to save.")
         return
-    headers = videos[0].keys()
     try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(videos)
+        videos.to_csv(output_file, index=False, encoding='utf-8')
         logging.info(f"Saved {len(videos)} filtered videos to {output_file}")
     except Exception as e:
         logging.error(f"Error writing to output file {output_file}: {e}")
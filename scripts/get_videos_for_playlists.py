@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 
+import asyncio
+import atexit
 import csv
+import json
 import logging
 import os
-import re
+from itertools import chain, islice
 
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 from logging_config import setup_logging
 
@@ -37,198 +40,324 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '..'))
 GENERATED_DIR = os.path.join(project_root, 'generated')
 OUTPUT_CSV = os.path.join(GENERATED_DIR, 'videos.csv')
+VIDEO_FIELDS = ['videoId', 'title', 'description', 'publishedAt', 'channelHandle']
+CHANNEL_HANDLE_CACHE_FILE = os.path.join(GENERATED_DIR, 'channel_handles.json')
 
 # Ensure the 'generated' directory exists
 os.makedirs(GENERATED_DIR, exist_ok=True)
 
-# Cache for channel handles to minimize API calls
+# YouTube Data API REST endpoints
+CHANNELS_URL = 'https://www.googleapis.com/youtube/v3/channels'
+PLAYLIST_ITEMS_URL = 'https://www.googleapis.com/youtube/v3/playlistItems'
+
+# channels.list accepts up to 50 IDs per request
+CHANNELS_BATCH_SIZE = 50
+
+# Playlists fetched at the same time, kept low to respect the API quota
+MAX_CONCURRENT_PLAYLISTS = 5
+
+# Total time limit of a single API request
+REQUEST_TIMEOUT_SECONDS = 30
+# Failures of a single API request, handled like HTTP errors
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError)
+
+
+def load_channel_handle_cache(filename):
+    """
+    Loads channel handles resolved in previous runs.
+
+    Args:
+        filename (str): Path to the JSON cache file.
+
+    Returns:
+        dict: Mapping of channel ID to channel handle.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable channel handle cache {filename}: {e}")
+        return {}
+
+
+def save_channel_handle_cache(filename):
+    """
+    Saves resolved channel handles for next runs.
+
+    Args:
+        filename (str): Path to the JSON cache file.
+    """
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(channel_handle_cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+    except OSError as e:
+        logging.error(f"Error while saving channel handle cache {filename}: {e}")
+
+
+# Cache for channel handles to minimize API calls, persisted across runs by `main`
 channel_handle_cache = {}
 
 
-def sanitize_channel_handle(channel_handle):
+async def fetch_json(session, url, params):
     """
-    Sanitizes the channel handle to create a safe directory name.
+    Sends a GET request and decodes the JSON response with orjson.
 
     Args:
-        channel_handle (str): The handle of the YouTube channel.
+        session (aiohttp.ClientSession): HTTP session.
+        url (str): Endpoint URL.
+        params (dict): Query parameters.
 
     Returns:
-        str: Sanitized channel handle.
+        dict: Decoded JSON response.
     """
-    sanitized = channel_handle.replace(' ', '_')
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', sanitized)
-    return sanitized[:50]
+    async with session.get(url, params=params) as response:
+        response.raise_for_status()
+        return orjson.loads(await response.read())
 
 
-def get_channel_handle(api_key, channel_id):
+async def get_channel_handles(session, api_key, channel_ids):
     """
-    Retrieves the channel handle for a given channel ID using the YouTube API.
+    Retrieves channel handles for given channel IDs using the YouTube API.
+    Uncached IDs are requested in batches of CHANNELS_BATCH_SIZE per API call.
 
     Args:
+        session (aiohttp.ClientSession): HTTP session.
         api_key (str): YouTube Data API key.
-        channel_id (str): The YouTube channel ID.
+        channel_ids (iterable): The YouTube channel IDs.
 
     Returns:
-        str: The channel handle.
+        dict: Mapping of channel ID to channel handle.
     """
-    if channel_id in channel_handle_cache:
-        logging.debug(f"Channel handle for {channel_id} fetched from cache.")
-        return channel_handle_cache[channel_id]
+    missing_ids = list(dict.fromkeys(cid for cid in channel_ids if cid not in channel_handle_cache))
+    if missing_ids:
+        logging.info(f"Start get_channel_handles for {len(missing_ids)} channels")
+        ids_iter = iter(missing_ids)
+        while batch := list(islice(ids_iter, CHANNELS_BATCH_SIZE)):
+            params = {
+                'part': 'snippet',
+                'id': ','.join(batch),
+                'maxResults': CHANNELS_BATCH_SIZE,
+                'key': api_key,
+            }
+            try:
+                response = await fetch_json(session, CHANNELS_URL, params)
+            except REQUEST_ERRORS as e:
+                # not cached, so it's retried on the next run
+                logging.error(f"HTTP Error while fetching channel handles for {batch}: {e}. Using fallback.")
+                continue
+
+            for item in response.get('items', []):
+                channel_id = item['id']
+                custom_url = item['snippet'].get('customUrl')
+                if custom_url:
+                    # Prevent double '@' by checking if custom_url already starts with '@'
+                    if custom_url.startswith('@'):
+                        handle = custom_url
+                    else:
+                        handle = '@' + custom_url
+                    logging.info(f"Found customUrl for channel_id={channel_id}: {handle}")
+                else:
+                    handle = '@' + channel_id
+                    logging.info(f"No customUrl for channel_id={channel_id}. Using channel_id as handle: {handle}")
+                channel_handle_cache[channel_id] = handle
+
+            for channel_id in batch:
+                if channel_id not in channel_handle_cache:
+                    logging.info(f"No channel found for channel_id={channel_id}. Using fallback.")
+                    channel_handle_cache[channel_id] = '@' + channel_id
+        logging.info("End get_channel_handles")
+
+    return {cid: channel_handle_cache.get(cid, '@' + cid) for cid in channel_ids}
+
+
+async def fetch_playlist_page(session, api_key, playlist_id, page_token):
+    """
+    Fetches one page of playlist items from the YouTube Data API REST endpoint.
 
-    logging.info(f"Start get_channel_handle for channel_id={channel_id}")
-    youtube = build('youtube', 'v3', developerKey=api_key)
-    try:
-        request = youtube.channels().list(
-            part='snippet',
-            id=channel_id,
-            maxResults=1
-        )
-        response = request.execute()
-    except HttpError as e:
-        logging.error(f"HTTP Error while fetching channel handle for {channel_id}: {e}")
-        handle = '@' + channel_id
-        channel_handle_cache[channel_id] = handle
-        logging.info("End get_channel_handle")
-        return handle
-
-    items = response.get('items', [])
-    if not items:
-        logging.info(f"No channel found for channel_id={channel_id}. Using fallback.")
-        handle = '@' + channel_id
-        channel_handle_cache[channel_id] = handle
-        logging.info("End get_channel_handle")
-        return handle
-
-    channel_snippet = items[0]['snippet']
-    custom_url = channel_snippet.get('customUrl')
-    if custom_url:
-        # Prevent double '@' by checking if custom_url already starts with '@'
-        if custom_url.startswith('@'):
-            handle = custom_url
-        else:
-            handle = '@' + custom_url
-        logging.info(f"Found customUrl for channel_id={channel_id}: {handle}")
-    else:
-        handle = '@' + channel_id
-        logging.info(f"No customUrl for channel_id={channel_id}. Using channel_id as handle: {handle}")
-
-    channel_handle_cache[channel_id] = handle
-    logging.info("End get_channel_handle")
-    return handle
-
-
-def get_videos_from_playlist(api_key, playlist_id):
+    Args:
+        session (aiohttp.ClientSession): HTTP session.
+        api_key (str): YouTube Data API key.
+        playlist_id (str): The YouTube playlist ID.
+        page_token (str or None): Token of the page to fetch, None for the first page.
+
+    Returns:
+        dict: Decoded JSON response.
     """
-    Retrieves all videos from a specified YouTube playlist.
+    params = {
+        'part': 'snippet,contentDetails',
+        'playlistId': playlist_id,
+        'maxResults': 50,
+        'key': api_key,
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    return await fetch_json(session, PLAYLIST_ITEMS_URL, params)
+
+
+async def get_playlist_items(session, semaphore, api_key, playlist_id):
+    """
+    Retrieves all items from a specified YouTube playlist, page by page.
 
     Args:
+        session (aiohttp.ClientSession): HTTP session.
+        semaphore (asyncio.Semaphore): Limits concurrently fetched playlists.
         api_key (str): YouTube Data API key.
         playlist_id (str): The YouTube playlist ID.
 
     Returns:
-        list: A list of dictionaries containing video data.
+        list: Playlist items as returned by the API.
     """
-    logging.info(f"Start get_videos_from_playlist for playlist_id={playlist_id}")
-    youtube = build('youtube', 'v3', developerKey=api_key)
-    videos = []
-    next_page_token = None
-    page_count = 0
+    async with semaphore:
+        logging.info(f"Start get_playlist_items for playlist_id={playlist_id}")
+        playlist_items = []
+        next_page_token = None
+        page_count = 0
 
-    while True:
-        try:
-            request = youtube.playlistItems().list(
-                part='snippet,contentDetails',
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-            response = request.execute()
-        except HttpError as e:
-            logging.error(f"HTTP Error while fetching playlist {playlist_id}: {e}")
-            break
-
-        page_count += 1
-        items = response.get('items', [])
-        logging.info(f"Processing page {page_count} of playlist {playlist_id}, found {len(items)} items")
-
-        for item in items:
-            video_id = item['contentDetails']['videoId']
-            title = item['snippet']['title']
-            description = item['snippet']['description']
-            published_at = item['contentDetails'].get('videoPublishedAt', '')
-            channel_id = item['snippet']['channelId']
-
-            channel_handle = get_channel_handle(api_key, channel_id)
-
-            video_data = {
-                'videoId': video_id,
-                'title': title,
-                'description': description,
-                'publishedAt': published_at,
-                'channelHandle': channel_handle
-            }
-            videos.append(video_data)
+        while True:
+            try:
+                response = await fetch_playlist_page(session, api_key, playlist_id, next_page_token)
+            except REQUEST_ERRORS as e:
+                logging.error(f"HTTP Error while fetching playlist {playlist_id}: {e}")
+                break
+
+            page_count += 1
+            items = response.get('items', [])
+            logging.info(f"Processing page {page_count} of playlist {playlist_id}, found {len(items)} items")
+
+            playlist_items.extend(items)
+
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+
+        logging.info(f"End get_playlist_items for playlist_id={playlist_id}, total items: {len(playlist_items)}")
+        return playlist_items
+
+
+async def get_all_playlist_items(session, api_key, playlist_ids):
+    """
+    Retrieves items of all playlists concurrently, at most MAX_CONCURRENT_PLAYLISTS at the same time.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session.
+        api_key (str): YouTube Data API key.
+        playlist_ids (list): The YouTube playlist IDs.
+
+    Returns:
+        list: Playlist items (list) or the raised exception for each playlist, in `playlist_ids` order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLAYLISTS)
+    return await asyncio.gather(
+        *[get_playlist_items(session, semaphore, api_key, playlist_id) for playlist_id in playlist_ids],
+        return_exceptions=True
+    )
+
+
+def get_videos_from_playlist_items(playlist_items, channel_handles):
+    """
+    Converts playlist items to video data.
 
-        next_page_token = response.get('nextPageToken')
-        if not next_page_token:
-            break
+    Args:
+        playlist_items (list): Playlist items as returned by the API.
+        channel_handles (dict): Mapping of channel ID to channel handle.
 
-    logging.info(f"End get_videos_from_playlist for playlist_id={playlist_id}, total videos: {len(videos)}")
+    Returns:
+        list: A list of dictionaries containing video data.
+    """
+    videos = []
+    for item in playlist_items:
+        video_data = {
+            'videoId': item['contentDetails']['videoId'],
+            'title': item['snippet']['title'],
+            'description': item['snippet']['description'],
+            'publishedAt': item['contentDetails'].get('videoPublishedAt', ''),
+            'channelHandle': channel_handles[item['snippet']['channelId']]
+        }
+        videos.append(video_data)
     return videos
 
 
-def load_existing_video_ids(filename):
+async def fetch_playlists(api_key, playlist_ids):
     """
-    Loads existing video IDs from a CSV file to avoid duplicates.
+    Retrieves items of all playlists and resolves channel handles for all of them at once.
 
     Args:
-        filename (str): Path to the CSV file.
+        api_key (str): YouTube Data API key.
+        playlist_ids (list): The YouTube playlist IDs.
+
+    Returns:
+        tuple: Playlist items (list) or the raised exception for each playlist, in `playlist_ids` order,
+            and mapping of channel ID to channel handle.
+    """
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)) as session:
+        all_playlist_items = await get_all_playlist_items(session, api_key, playlist_ids)
+        channel_ids = {
+            item['snippet']['channelId']
+            for playlist_items in all_playlist_items if not isinstance(playlist_items, Exception)
+            for item in playlist_items
+        }
+        channel_handles = await get_channel_handles(session, api_key, channel_ids)
+    return all_playlist_items, channel_handles
+
+
+def load_existing_video_ids(f):
+    """
+    Loads existing video IDs from the CSV file to avoid duplicates.
+    Leaves the file positioned at its end, ready for appending.
+
+    Args:
+        f (file): CSV file opened in 'a+' mode.
 
     Returns:
         set: A set of existing video IDs.
     """
     existing_ids = set()
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                existing_ids.add(row['videoId'])
-    logging.debug(f"Loaded {len(existing_ids)} existing video IDs from {filename}")
+    f.seek(0)
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header:
+        video_id_index = header.index('videoId')
+        existing_ids.update(row[video_id_index] for row in reader if row)
+    f.seek(0, os.SEEK_END)
+    logging.debug(f"Loaded {len(existing_ids)} existing video IDs from {f.name}")
     return existing_ids
 
 
-def append_unique_videos_to_csv(videos, filename):
+def append_unique_videos_to_csv(videos, f, existing_ids):
     """
     Appends unique videos to the CSV file.
 
     Args:
         videos (list): List of video data dictionaries.
-        filename (str): Path to the CSV file.
+        f (file): CSV file opened in 'a+' mode.
+        existing_ids (set): Video IDs already in the CSV file, updated with the appended ones.
     """
     logging.info("Start append_unique_videos_to_csv")
-    existing_ids = load_existing_video_ids(filename)
-
-    new_videos = [v for v in videos if v['videoId'] not in existing_ids]
-
-    if not new_videos:
+    new_rows = []
+    new_ids = set()
+    for v in videos:
+        if v['videoId'] not in existing_ids and v['videoId'] not in new_ids:
+            new_ids.add(v['videoId'])
+            new_rows.append([v[key] for key in VIDEO_FIELDS])
+
+    if not new_rows:
         logging.info("No new videos to append.")
         logging.info("End append_unique_videos_to_csv")
         return
 
-    file_exists = os.path.exists(filename)
-    keys = ['videoId', 'title', 'description', 'publishedAt', 'channelHandle']
-
     try:
-        with open(filename, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(new_videos)
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(VIDEO_FIELDS)
+        writer.writerows(new_rows)
     except Exception as e:
-        logging.error(f"Error while writing to CSV {filename}: {e}")
+        logging.error(f"Error while writing to CSV {f.name}: {e}")
         return
 
-    logging.info(f"Appended {len(new_videos)} new videos to {filename}")
+    existing_ids |= new_ids
+    logging.info(f"Appended {len(new_rows)} new videos to {f.name}")
     logging.info("End append_unique_videos_to_csv")
 
 
@@ -242,14 +371,28 @@ def main():
     setup_logging(script_name)
 
     logging.info("Start main")
-    for playlist_id in PLAYLIST_IDS:
+    channel_handle_cache.update(load_channel_handle_cache(CHANNEL_HANDLE_CACHE_FILE))
+    logging.info(f"Loaded {len(channel_handle_cache)} cached channel handles")
+    atexit.register(save_channel_handle_cache, CHANNEL_HANDLE_CACHE_FILE)
+    all_playlist_items, channel_handles = asyncio.run(fetch_playlists(API_KEY, PLAYLIST_IDS))
+
+    playlist_videos = []
+    for playlist_id, playlist_items in zip(PLAYLIST_IDS, all_playlist_items):
+        if isinstance(playlist_items, Exception):
+            logging.error(f"Unexpected error while fetching playlist {playlist_id}: {playlist_items}")
+            continue
         try:
-            videos = get_videos_from_playlist(API_KEY, playlist_id)
+            videos = get_videos_from_playlist_items(playlist_items, channel_handles)
             logging.info(f"Fetched {len(videos)} videos from playlist {playlist_id}.")
-            append_unique_videos_to_csv(videos, OUTPUT_CSV)
+            playlist_videos.append(videos)
         except Exception as e:
             logging.error(f"Unexpected error while processing playlist {playlist_id}: {e}")
             continue  # Proceed to the next playlist
+
+    # Read existing IDs and append new videos of all playlists at once, through the same file handle
+    with open(OUTPUT_CSV, 'a+', newline='', encoding='utf-8') as f:
+        existing_ids = load_existing_video_ids(f)
+        append_unique_videos_to_csv(list(chain.from_iterable(playlist_videos)), f, existing_ids)
     logging.info("End main")
 
 
@@ -1,35 +1,26 @@
 # guest_calculator.py
 
-def calculate_guest(channel_handle, title, description):
+def calculate_guests(channel_handles, titles, descriptions):
     """
-    Calculates the guest field based on channelHandle, title, and description.
+    Calculates the guest field based on channelHandle, title, and description, for whole columns at once:
+    the stripped handle followed by the first words (up to 20 characters) of the title and the description.
 
     Args:
-        channel_handle (str): The handle of the YouTube channel.
-        title (str): The title of the video.
-        description (str): The description of the video.
+        channel_handles (pd.Series): Handles of the YouTube channels.
+        titles (pd.Series): Titles of the videos.
+        descriptions (pd.Series): Descriptions of the videos.
 
     Returns:
-        str: The calculated guest string.
+        pd.Series: The calculated guest strings.
     """
-    # All should be strings!
-    if not isinstance(channel_handle, str):
-        channel_handle = str(channel_handle) if channel_handle is not None else ''
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ''
-    if not isinstance(description, str):
-        description = str(description) if description is not None else ''
-
     # todo: code me, dummy logic now
-    first_word_title = title.split()[0] if title.strip() else ''
-    first_word_description = description.split()[0] if description.strip() else ''
-    guest_parts = [channel_handle.strip()]
-
-    if first_word_title:
-        guest_parts.append(first_word_title[:20])
-    if first_word_description:
-        guest_parts.append(first_word_description[:20])
+    def first_words(column):
+        return column.fillna('').astype(str).str.split(n=1).str[0].fillna('').str[:20]
 
-    guest = ' '.join(guest_parts)
+    first_word_titles = first_words(titles)
+    first_word_descriptions = first_words(descriptions)
 
-    return guest
+    guests = channel_handles.fillna('').astype(str).str.strip()
+    guests = guests + (' ' + first_word_titles).where(first_word_titles != '', '')
+    guests = guests + (' ' + first_word_descriptions).where(first_word_descriptions != '', '')
+    return guests
@@ -1,6 +1,13 @@
+import atexit
 import logging
 import os
+import queue
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# Handlers configured by `setup_logging`, also used for records of worker processes
+_handlers = []
 
 
 def setup_logging(script_name, level=logging.INFO):
@@ -30,13 +37,57 @@ def setup_logging(script_name, level=logging.INFO):
     log_filename = f"{timestamp}_{script_name}.log"
     log_file_path = os.path.join(logs_dir, log_filename)
 
-    # Configure logging
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler(log_file_path),
-            logging.StreamHandler()
-        ]
-    )
+    # Configure logging, records are written by a background thread so logging calls don't block on I/O
+    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    handlers = [
+        logging.FileHandler(log_file_path),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    # only merges message with its args, the rest of the format is applied by the listener's handlers
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, *handlers)
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
+    _handlers[:] = handlers
+
+
+@contextmanager
+def worker_logging(mp_context):
+    """
+    Forwards log records of worker processes to the handlers of `setup_logging`.
+    Works with every start method, workers don't inherit the logging setup under 'spawn' and 'forkserver'.
+
+    Args:
+        mp_context (multiprocessing.context.BaseContext): Context the worker processes are started with.
+
+    Yields:
+        multiprocessing.Queue: Queue to pass to `setup_worker_logging` in each worker.
+    """
+    log_queue = mp_context.Queue(-1)
+    listener = QueueListener(log_queue, *_handlers)
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+
+
+def setup_worker_logging(log_queue, level=logging.INFO):
+    """
+    Sends all log records of a worker process to the queue from `worker_logging`.
+
+    Args:
+        log_queue (multiprocessing.Queue): Queue read by the parent process.
+        level (int): Logging verbosity level.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
@@ -43,13 +43,15 @@ def main():
         logging.info(f"Downloaded: {video_id}")
 
         # save
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            for entry in transcript:
-                start = entry.get('start', 0)
-                minutes, seconds = divmod(int(start), 60)
-                time_str = f"{minutes}:{seconds:02d}"
-                text = entry.get('text', '').replace('\n', ' ').strip()
-                f.write(f"[{time_str}] {text}\n")
+        lines = []
+        for entry in transcript:
+            start = entry.get('start', 0)
+            minutes, seconds = divmod(int(start), 60)
+            time_str = f"{minutes}:{seconds:02d}"
+            text = entry.get('text', '').replace('\n', ' ').strip()
+            lines.append(f"[{time_str}] {text}\n")
+        with open(transcript_path, 'wb', buffering=1 << 20) as f:
+            f.write(''.join(lines).encode('utf-8'))
 
         logging.info(f"Saved {transcript_path}")
 
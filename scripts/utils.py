@@ -0,0 +1,20 @@
+# utils.py
+
+from functools import lru_cache
+
+# Spaces become underscores, characters not allowed in directory names are removed
+_SANITIZE_TABLE = str.maketrans({' ': '_', **{c: None for c in '<>:"/\\|?*'}})
+
+
+@lru_cache(maxsize=8192)
+def sanitize_channel_handle(channel_handle):
+    """
+    Sanitizes the channel handle to create a safe directory name.
+
+    Args:
+        channel_handle (str): The handle of the YouTube channel.
+
+    Returns:
+        str: Sanitized channel handle.
+    """
+    return channel_handle.translate(_SANITIZE_TABLE)[:50]
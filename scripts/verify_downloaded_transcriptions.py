@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
 import csv
+import json
 import logging
+import mmap
 import os
-import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 
 from logging_config import setup_logging
+from utils import sanitize_channel_handle
 
 # Default path to the CSV file
 DEFAULT_INPUT_FILE = '../generated/filtered_videos.csv'
@@ -14,72 +25,293 @@ DEFAULT_INPUT_FILE = '../generated/filtered_videos.csv'
 # Directory where transcriptions are stored
 TRANSCRIPTION_DIR = '../transcriptions'
 
+# Columns read from the filtered videos CSV
+VIDEO_COLUMNS = ('videoId', 'channelHandle')
+
+# Rows per chunk when splitting unquoted CSV files
+CHUNK_SIZE = 100_000
+
+# Threads scanning channel directories
+MAX_SCAN_WORKERS = 32
+
 # Determine the script's directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '..'))
 GENERATED_DIR = os.path.join(project_root, 'generated')
+SCAN_CACHE_FILE = os.path.join(GENERATED_DIR, 'verify_scan_cache.json')
+MISSING_CSV = os.path.join(GENERATED_DIR, 'missing.csv')
+
+# Directories modified this recently are not cached, their mtime may not change on the next write yet
+SCAN_CACHE_MIN_AGE_NS = 2_000_000_000
+
+# Ensure the 'generated' directory exists
+os.makedirs(GENERATED_DIR, exist_ok=True)
 
+# Scanned channel directories, persisted across runs by `main`:
+# absolute directory path -> {'mtime_ns': directory mtime, 'video_ids': video IDs with a transcription}
+scan_cache = {}
 
-def sanitize_channel_handle(channel_handle):
+
+def load_scan_cache(filename):
     """
-    Sanitizes the channel name to match directory naming.
+    Loads channel directory scans from previous runs.
 
     Args:
-        channel_handle (str): The handle of the YouTube channel.
+        filename (str): Path to the JSON cache file.
 
     Returns:
-        str: Sanitized channel handle.
+        dict: Mapping of channel directory to its mtime and video IDs.
     """
-    sanitized = channel_handle.replace(' ', '_')
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', sanitized)
-    return sanitized[:50]
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning("Ignoring unreadable scan cache %s: %s", filename, e)
+        return {}
+
 
-def load_filtered_videos(csv_file):
+def save_scan_cache(filename):
     """
-    Loads video data from a CSV file.
+    Saves channel directory scans for next runs.
 
     Args:
-        csv_file (str): Path to the CSV file.
+        filename (str): Path to the JSON cache file.
+    """
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(scan_cache, f)
+    except OSError as e:
+        logging.error("Error while saving scan cache %s: %s", filename, e)
+
+
+def list_channel_transcripts(channel_dir):
+    """
+    Lists transcription files of one channel with a single `os.scandir`.
+    The scan is skipped if the directory's mtime didn't change since it was cached.
+
+    Args:
+        channel_dir (str): Directory with the channel's transcriptions.
+
+    Returns:
+        set: Video IDs with a transcription, empty if the directory doesn't exist.
+    """
+    channel_dir = os.path.abspath(channel_dir)
+    try:
+        mtime_ns = os.stat(channel_dir).st_mtime_ns
+    except FileNotFoundError:
+        return set()
+
+    cached = scan_cache.get(channel_dir)
+    if cached and cached['mtime_ns'] == mtime_ns:
+        return set(cached['video_ids'])
+
+    try:
+        with os.scandir(channel_dir) as it:
+            # `is_file` uses the file type cached by scandir, no extra stat on most filesystems
+            video_ids = {entry.name[:-4] for entry in it if entry.name.endswith('.txt') and entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+    if time.time_ns() - mtime_ns >= SCAN_CACHE_MIN_AGE_NS:
+        scan_cache[channel_dir] = {'mtime_ns': mtime_ns, 'video_ids': sorted(video_ids)}
+    return video_ids
+
+
+def find_missing_in_channel(transcription_dir, sanitized_handle, video_ids):
+    """
+    Searches for missing transcription files of one channel.
+
+    Args:
+        transcription_dir (str): Directory where transcriptions are stored.
+        sanitized_handle (str): Sanitized channel handle.
+        video_ids (list): Video IDs of the channel.
 
     Returns:
-        dict: Mapping of 'videoId' to 'sanitized_channel_handle'.
+        list: List of tuples containing missing 'videoId' and 'channelHandle', sorted by 'videoId'.
+    """
+    present = list_channel_transcripts(os.path.join(transcription_dir, sanitized_handle))
+    missing_ids = set(video_ids) - present
+    return [(video_id, sanitized_handle) for video_id in sorted(missing_ids)]
+
+def iter_video_chunks_mmap(mm):
+    """
+    Reads 'videoId' and 'channelHandle' columns from a memory-mapped CSV file, splitting lines on commas.
+    Only files without quoted fields can be split like that.
+
+    Args:
+        mm (mmap.mmap): Memory-mapped CSV file.
+
+    Yields:
+        pd.DataFrame: Up to CHUNK_SIZE rows of 'videoId' and 'channelHandle' columns.
+
+    Raises:
+        ValueError: If the header has no 'videoId' or 'channelHandle' column.
+    """
+    lines = iter(mm.readline, b'')
+    header = next(lines).rstrip(b'\r\n').decode('utf-8').split(',')
+    video_id_index = header.index('videoId')
+    channel_handle_index = header.index('channelHandle')
+
+    rows = []
+    for line in lines:
+        line = line.rstrip(b'\r\n')
+        if not line:
+            continue
+        fields = line.split(b',')
+        if len(fields) != len(header):
+            # the same as `_skip_invalid_row` does for the pyarrow reader
+            logging.warning("Skipping malformed row: %s", line.decode('utf-8', errors='replace'))
+            continue
+        rows.append((fields[video_id_index].decode('utf-8'), fields[channel_handle_index].decode('utf-8')))
+        if len(rows) == CHUNK_SIZE:
+            yield pd.DataFrame(rows, columns=list(VIDEO_COLUMNS))
+            rows = []
+    if rows:
+        yield pd.DataFrame(rows, columns=list(VIDEO_COLUMNS))
+
+
+def _skip_invalid_row(row):
+    """
+    Logs and skips a CSV row with a wrong number of columns.
+    """
+    logging.warning("Skipping malformed row: %s", row.text)
+    return 'skip'
+
+
+def iter_video_chunks_arrow(csv_file):
+    """
+    Reads 'videoId' and 'channelHandle' columns from a CSV file with the streaming pyarrow reader.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+
+    Yields:
+        pd.DataFrame: One record batch of 'videoId' and 'channelHandle' columns.
+
+    Raises:
+        pa.ArrowException: If the file is empty or has no 'videoId' or 'channelHandle' column.
+    """
+    with pacsv.open_csv(
+        csv_file,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=_skip_invalid_row),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(VIDEO_COLUMNS),
+            column_types={column: pa.string() for column in VIDEO_COLUMNS},
+            strings_can_be_null=False
+        )
+    ) as reader:
+        for batch in reader:
+            yield batch.to_pandas()
+
+
+def iter_video_chunks(csv_file):
+    """
+    Reads 'videoId' and 'channelHandle' columns chunk by chunk.
+    Files without quoted fields are split on commas through mmap, others are parsed by pyarrow.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+
+    Yields:
+        pd.DataFrame: 'videoId' and 'channelHandle' columns of the next chunk of rows.
+    """
+    with open(csv_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Empty CSV file: {csv_file}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            quoted = mm.find(b'"') != -1
+            if not quoted:
+                yield from iter_video_chunks_mmap(mm)
+    if quoted:
+        yield from iter_video_chunks_arrow(csv_file)
+
+
+def iter_filtered_videos(csv_file):
+    """
+    Streams video data from a CSV file, so only one chunk of rows is in memory at a time.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+
+    Yields:
+        tuple: ('videoId', 'sanitized_channel_handle') for every valid row.
+
+    Raises:
+        ValueError, pyarrow.ArrowException: If the columns cannot be read, possibly after some rows were yielded.
     """
-    mapping = {}
     if not os.path.exists(csv_file):
-        logging.error(f"Filtered videos CSV file does not exist: {csv_file}")
-        return mapping
-
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            video_id = row.get('videoId')
-            channel_handle = row.get('channelHandle')
-            if video_id and channel_handle:
-                sanitized_handle = sanitize_channel_handle(channel_handle)
-                mapping[video_id] = sanitized_handle
-                logging.debug(f"Loaded videoId={video_id}, guest={sanitized_handle}")
-            else:
-                logging.warning(f"Missing videoId or channelHandle in row: {row}")
-    logging.info(f"Loaded {len(mapping)} videos from {csv_file}")
-    return mapping
-
-def find_missing_transcriptions(filtered_videos_map, transcription_dir):
+        logging.error("Filtered videos CSV file does not exist: %s", csv_file)
+        return
+
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for df in iter_video_chunks(csv_file):
+        valid = (df['videoId'] != '') & (df['channelHandle'] != '')
+        for video_id, channel_handle in zip(df.loc[~valid, 'videoId'], df.loc[~valid, 'channelHandle']):
+            logging.warning("Missing videoId or channelHandle in row: videoId=%r, channelHandle=%r", video_id, channel_handle)
+
+        # sanitize each distinct handle of the chunk once
+        channel_handles = df.loc[valid, 'channelHandle']
+        sanitized = {handle: sanitize_channel_handle(handle) for handle in channel_handles.unique()}
+        for video_id, sanitized_handle in zip(df.loc[valid, 'videoId'], channel_handles.map(sanitized)):
+            if debug:
+                logging.debug("Loaded videoId=%s, guest=%s", video_id, sanitized_handle)
+            yield video_id, sanitized_handle
+
+
+def group_videos_by_handle(videos):
+    """
+    Groups video IDs by sanitized channel handle.
+
+    Args:
+        videos (iterable): ('videoId', 'sanitized_channel_handle') tuples.
+
+    Returns:
+        dict: Mapping of 'sanitized_channel_handle' to a list of unique 'videoId's.
+    """
+    by_handle = defaultdict(dict)
+    for video_id, sanitized_handle in videos:
+        by_handle[sanitized_handle][video_id] = None
+    return {sanitized_handle: list(video_ids) for sanitized_handle, video_ids in by_handle.items()}
+
+
+def find_missing_transcriptions(videos_by_handle, transcription_dir):
     """
     Searches for missing transcription files.
 
     Args:
-        filtered_videos_map (dict): Mapping of 'videoId' to 'sanitized_channel_handle'.
+        videos_by_handle (dict): Mapping of 'sanitized_channel_handle' to a list of 'videoId's.
         transcription_dir (str): Directory where transcriptions are stored.
 
     Returns:
         list: List of tuples containing missing 'videoId' and 'channelHandle'.
     """
-    missing = []
-    for video_id, sanitized_handle in filtered_videos_map.items():
-        transcription_file = os.path.join(transcription_dir, sanitized_handle, f"{video_id}.txt")
-        if not os.path.exists(transcription_file):
-            missing.append((video_id, sanitized_handle))
-    return missing
+    if not videos_by_handle:
+        return []
+
+    # Directory scans are I/O bound, so channels are scanned in threads
+    with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, len(videos_by_handle))) as executor:
+        results = executor.map(
+            find_missing_in_channel, repeat(transcription_dir), videos_by_handle.keys(), videos_by_handle.values()
+        )
+        return list(chain.from_iterable(results))
+
+def save_missing_transcriptions(missing_transcriptions, filename):
+    """
+    Saves missing transcriptions to a CSV file with a single `writerows` call.
+    An empty list still writes the header, replacing any earlier report.
+
+    Args:
+        missing_transcriptions (list): List of tuples containing missing 'videoId' and 'channelHandle'.
+        filename (str): Path to the output CSV file.
+    """
+    try:
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([('videoId', 'channelHandle'), *missing_transcriptions])
+    except OSError as e:
+        logging.error("Error while writing missing transcriptions to %s: %s", filename, e)
+
 
 def main():
 
@@ -100,21 +332,31 @@ def main():
     input_file = args.input_file
 
     logging.info("Starting verification")
+    scan_cache.update(load_scan_cache(SCAN_CACHE_FILE))
+    atexit.register(save_scan_cache, SCAN_CACHE_FILE)
 
-    # Load video data
-    filtered_videos_map = load_filtered_videos(input_file)
-    if not filtered_videos_map:
+    # Stream video data straight into the per-channel grouping
+    try:
+        videos_by_handle = group_videos_by_handle(iter_filtered_videos(input_file))
+    except (ValueError, pa.ArrowException) as e:
+        # a partial grouping would report the unread videos as present, so write no report at all
+        logging.error("Cannot read videoId/channelHandle columns from filtered videos CSV file %s: %s. Exiting.", input_file, e)
+        return
+    video_count = sum(len(video_ids) for video_ids in videos_by_handle.values())
+    logging.info("Loaded %d videos from %s", video_count, input_file)
+    if not videos_by_handle:
         logging.error("No videos to analyze. Exiting.")
         return
 
     # Find missing transcriptions
-    missing_transcriptions = find_missing_transcriptions(filtered_videos_map, TRANSCRIPTION_DIR)
+    missing_transcriptions = find_missing_transcriptions(videos_by_handle, TRANSCRIPTION_DIR)
+
+    # Always rewrite the report so a previous run's list never goes stale
+    save_missing_transcriptions(missing_transcriptions, MISSING_CSV)
 
     # Display results
     if missing_transcriptions:
-        logging.info(f"Missing {len(missing_transcriptions)} transcriptions:")
-        for vid, handle in missing_transcriptions:
-            logging.info(f"Video ID: {vid}, Channel Handle: {handle}")
+        logging.info("Missing %d transcriptions, listed in %s", len(missing_transcriptions), MISSING_CSV)
     else:
         logging.info("All transcriptions are present.")
 